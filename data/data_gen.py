@@ -1,12 +1,54 @@
 import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
-import random
 import math
 import csv
+from dataclasses import dataclass
+
+try:
+    from numba import njit, prange
+    _HAVE_NUMBA = True
+except ImportError:  # numba is optional, positions are then accumulated with np.cumsum
+    _HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Loading the compiled kernel costs ~0.15s per process, which its faster pass only pays back for very long datasets
+_FILL_POSITIONS_MIN_SAMPLES = 25_000_000
+
+@njit(parallel=True, cache=True)
+def _fill_positions(steps, base, out):
+    """Running sum of (2, N) lat/lon steps starting at base, written into out in one pass"""
+    # The running sum is serial, but the latitude and longitude rows are independent
+    for axis in prange(steps.shape[0]):
+        position = base[axis]
+        for i in range(steps.shape[1]):
+            position += steps[axis, i]
+            out[axis, i] = position
+
+@dataclass
+class GNSSResult:
+    """Generated GNSS samples as NumPy arrays, one entry per sample"""
+    timestamp: np.ndarray
+    latitude: np.ndarray
+    longitude: np.ndarray
+    
+    def __len__(self):
+        return len(self.timestamp)
+    
+    def to_pandas(self):
+        """Materialize the samples as a timestamp/latitude/longitude DataFrame"""
+        return pd.DataFrame({
+            'timestamp': self.timestamp,
+            'latitude': self.latitude,
+            'longitude': self.longitude
+        }, copy=False)
 
 class GNSSDataGenerator:
-    def __init__(self, base_lat=37.7749, base_lon=-122.4194, duration_minutes=10, sample_rate_hz=1):
+    def __init__(self, base_lat=37.7749, base_lon=-122.4194, duration_minutes=10, sample_rate_hz=1, seed=None):
         """
         Initialize GNSS data generator
         
@@ -15,34 +57,41 @@ class GNSSDataGenerator:
             base_lon: Base longitude (default: San Francisco) 
             duration_minutes: Duration of data collection in minutes
             sample_rate_hz: Sampling rate in Hz (samples per second)
+            seed: Seed for the random number generator, for reproducible datasets
         """
         self.base_lat = base_lat
         self.base_lon = base_lon
         self.duration_minutes = duration_minutes
         self.sample_rate_hz = sample_rate_hz
         self.total_samples = int(duration_minutes * 60 * sample_rate_hz)
-    
-    def simulate_movement_pattern(self, time_index):
-        """Simulate 1km straight line movement"""
-        # Calculate total distance to cover (1000 meters)
-        total_distance_m = 1000.0
-        
-        # Calculate distance per sample
-        distance_per_sample = total_distance_m / self.total_samples
+        self.rng = np.random.default_rng(seed)
         
-        # Fixed direction (heading north-east at 45 degrees)
-        direction = math.pi / 4  # 45 degrees (north-east)
+        # Meters to degrees conversion factors, constant for the base position
+        self._cos_base_lat = math.cos(math.radians(base_lat))
+        self._inv_lat_deg_per_m = 1.0 / 111320.0
+        self._inv_lon_deg_per_m = 1.0 / (111320.0 * self._cos_base_lat)
         
-        # Convert distance to lat/lon movement
-        lat_drift = (distance_per_sample * math.cos(direction)) / 111320.0
-        lon_drift = (distance_per_sample * math.sin(direction)) / (111320.0 * math.cos(math.radians(self.base_lat)))
+        # Movement pattern: 1km straight line heading north-east (45 degrees)
+        total_distance_m = 1000.0
+        # No samples means no movement (e.g. duration_minutes=0)
+        distance_per_sample = total_distance_m / self.total_samples if self.total_samples else 0.0
+        direction = math.pi / 4
+        self._lat_drift_per_sample = distance_per_sample * math.cos(direction) * self._inv_lat_deg_per_m
+        self._lon_drift_per_sample = distance_per_sample * math.sin(direction) * self._inv_lon_deg_per_m
         
-        # Add small random noise to make it more realistic (±1 meter)
+        # Small random noise to make it more realistic (±1 meter)
         noise_factor = 1.0  # meters
-        lat_noise = random.gauss(0, noise_factor / 111320.0)
-        lon_noise = random.gauss(0, noise_factor / (111320.0 * math.cos(math.radians(self.base_lat))))
+        self._lat_noise_scale = noise_factor * self._inv_lat_deg_per_m
+        self._lon_noise_scale = noise_factor * self._inv_lon_deg_per_m
+    
+    def simulate_movement_pattern(self):
+        """Simulate 1km straight line movement, returning per-sample steps as (2, N) lat/lon rows"""
+        # One draw for both axes, centered on the drift so it needs no separate add
+        steps = self.rng.normal(loc=[[self._lat_drift_per_sample], [self._lon_drift_per_sample]],
+                                scale=[[self._lat_noise_scale], [self._lon_noise_scale]],
+                                size=(2, self.total_samples))
         
-        return lat_drift + lat_noise, lon_drift + lon_noise
+        return steps
     
     def generate_gnss_data(self):
         """Generate the complete GNSS dataset"""
@@ -51,55 +100,52 @@ class GNSSDataGenerator:
         print(f"Sample rate: {self.sample_rate_hz} Hz")
         print(f"Total samples: {self.total_samples}")
         
-        # Initialize data storage
-        timestamps = []
-        latitudes = []
-        longitudes = []
+        # Timestamps for every sample in one call
+        timestamps = pd.date_range(start=pd.Timestamp.now(), periods=self.total_samples,
+                                   freq=pd.Timedelta(seconds=1.0 / self.sample_rate_hz))
         
-        # Starting position
-        current_lat = self.base_lat
-        current_lon = self.base_lon
-        start_time = datetime.now()
+        # Movement for all samples at once, accumulated in place from the starting position
+        steps = self.simulate_movement_pattern()
+        positions = np.empty((2, self.total_samples), dtype=np.float64)
+        base = np.array([self.base_lat, self.base_lon])
+        if _HAVE_NUMBA and self.total_samples >= _FILL_POSITIONS_MIN_SAMPLES:
+            _fill_positions(steps, base, positions)
+        else:
+            # Start the sum from the base position so both paths add in the same order
+            if self.total_samples:
+                steps[:, 0] += base
+            np.cumsum(steps, axis=1, out=positions)
+        latitudes, longitudes = positions
         
-        for i in range(self.total_samples):
-            # Calculate timestamp
-            timestamp = start_time + timedelta(seconds=i / self.sample_rate_hz)
-            
-            # Add movement
-            lat_movement, lon_movement = self.simulate_movement_pattern(i)
-            current_lat += lat_movement
-            current_lon += lon_movement
-            
-            # Store data
-            timestamps.append(timestamp)
-            latitudes.append(current_lat)
-            longitudes.append(current_lon)
-            
-            # Progress indicator
-            if i % (self.total_samples // 10) == 0:
-                progress = (i / self.total_samples) * 100
-                print(f"Progress: {progress:.1f}%")
-        
-        # Create DataFrame
-        data = pd.DataFrame({
-            'timestamp': timestamps,
-            'latitude': latitudes,
-            'longitude': longitudes
-        })
-        
-        return data
+        return GNSSResult(timestamp=timestamps.values, latitude=latitudes, longitude=longitudes)
+    
+    def _write_csv(self, data, filepath, chunk_rows=100_000 // 3):
+        """Write the timestamp/latitude/longitude arrays in the same format as DataFrame.to_csv"""
+        # Rows are formatted and written a chunk at a time to keep memory flat. The chunk size
+        # matches to_csv's, which picks the timestamp precision per chunk.
+        with open(filepath, 'w', buffering=1 << 20) as fp:
+            fp.write('timestamp,latitude,longitude\n')
+            for start in range(0, len(data), chunk_rows):
+                stop = start + chunk_rows
+                ts_strings = pd.DatetimeIndex(data.timestamp[start:stop]).astype(str)
+                # repr() keeps the full float precision, same as to_csv
+                fp.write('\n'.join(map(','.join, zip(ts_strings.tolist(),
+                                                     map(repr, data.latitude[start:stop].tolist()),
+                                                     map(repr, data.longitude[start:stop].tolist())))))
+                fp.write('\n')
     
     def save_data(self, data, filename='gnss_data.csv'):
         """Save data to CSV file"""
         filepath = f"/home/morrisubuntu/Desktop/long_lat_calc/{filename}"
-        data.to_csv(filepath, index=False)
+        self._write_csv(data, filepath)
         print(f"\nData saved to: {filepath}")
         print(f"Total records: {len(data)}")
         
         # Print statistics
         print("\nData Statistics:")
-        print(f"Latitude range: {data['latitude'].min():.6f} to {data['latitude'].max():.6f}")
-        print(f"Longitude range: {data['longitude'].min():.6f} to {data['longitude'].max():.6f}")
+        if len(data):
+            print(f"Latitude range: {data.latitude.min():.6f} to {data.latitude.max():.6f}")
+            print(f"Longitude range: {data.longitude.min():.6f} to {data.longitude.max():.6f}")
         
         return filepath
 
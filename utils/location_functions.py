@@ -1,6 +1,44 @@
 import math
-from geopy.distance import geodesic
-from datetime import datetime
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+
+try:
+    from numba import njit, vectorize
+except ImportError:  # numba is optional, the kernels then run as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+    def vectorize(*args, **kwargs):
+        return lambda func: np.vectorize(func, otypes=[float])
+
+try:
+    # Ahead-of-time compiled kernels, built with `python utils/location_native.py`
+    from ._location_native import predict as _native_predict, predict_history as _native_predict_history, bearing as _native_bearing
+except ImportError:  # not built, use the JIT kernels above
+    _native_predict = _native_predict_history = _native_bearing = None
+
+_EARTH_RADIUS_M = 6371008.8  # mean Earth radius
+
+
+@njit(cache=True)
+def _haversine_m(lat1, lon1, lat2, lon2, R=_EARTH_RADIUS_M):
+    """Great-circle distance in meters between two (lat, lon) points."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dl = math.radians(lon2 - lon1)
+    a = math.sin(dphi/2)**2 + math.cos(phi1)*math.cos(phi2)*math.sin(dl/2)**2
+    return 2*R*math.asin(math.sqrt(a))
+
+def _haversine_m_vec(lat1, lon1, lat2, lon2, R=_EARTH_RADIUS_M):
+    """Element-wise haversine distance in meters for broadcastable arrays."""
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    dphi = phi2 - phi1
+    dl = np.radians(np.subtract(lon2, lon1))
+    a = np.sin(dphi/2)**2 + np.cos(phi1)*np.cos(phi2)*np.sin(dl/2)**2
+    return 2*R*np.arcsin(np.sqrt(a))
 
 def predict_future_dist_with_dir_and_speed(current_long, current_lat, target_long, target_lat, direction, speed, time) -> tuple:
     """
@@ -24,48 +62,200 @@ def predict_future_dist_with_dir_and_speed(current_long, current_lat, target_lon
             - percent_complete (float): Trip completion percentage (0–100).
     """
 
+    predict_core = _native_predict if _native_predict is not None else _predict_dir_and_speed_core
+    return predict_core(current_long, current_lat, target_long, target_lat, direction, speed, time)
+
+
+def predict_future_dist_with_dir_and_speed_batch(current_long, current_lat, target_long, target_lat, direction, speed, time) -> tuple:
+    """
+    Vectorized predict_future_dist_with_dir_and_speed over arrays of positions,
+    e.g. every row of a GNSS log, towards a single target.
+
+    Args:
+        current_long (np.ndarray): Current longitudes.
+        current_lat (np.ndarray): Current latitudes.
+        target_long (float): Target longitude.
+        target_lat (float): Target latitude.
+        direction (np.ndarray): Movement directions in degrees (0 = north, 90 = east).
+        speed (np.ndarray): Speeds in km/h.
+        time (np.ndarray): Time intervals in seconds.
+
+    Returns:
+        tuple: (Predicted_longitude, Predicted_latitude, distance_traveled, percent_complete)
+            as np.ndarray, one element per input row.
+    """
+
     distance_traveled = ((speed * 1000)/3600) * time
     
     # Calculate change in coordinates # https://www.sciencing.com/convert-distances-degrees-meters-7858322/
-    lat_change = (distance_traveled * math.cos(math.radians(direction))) / 111111.0
-    lon_change = (distance_traveled * math.sin(math.radians(direction))) / (111111.0 * math.cos(math.radians(current_lat)))
+    direction_rad = np.radians(direction)
+    inv_lon_scale = 1.0 / (111111.0 * np.cos(np.radians(current_lat)))
+    lat_change = (distance_traveled * np.cos(direction_rad)) / 111111.0
+    lon_change = distance_traveled * np.sin(direction_rad) * inv_lon_scale
     
     # Calculate predicted position
     Predicted_latitude = current_lat + lat_change
     Predicted_longitude = current_long + lon_change
     
-    # Calculate total distance from current to target using geodesic
-    total_distance = geodesic((current_lat, current_long), (target_lat, target_long)).meters
-    remaining_distance = geodesic((Predicted_latitude, Predicted_longitude), (target_lat, target_long)).meters
+    # Calculate total distance from current to target using haversine
+    total_distance = _haversine_m_vec(current_lat, current_long, target_lat, target_long)
+    remaining_distance = _haversine_m_vec(Predicted_latitude, Predicted_longitude, target_lat, target_long)
     
-    # Calculate percentage complete
-    if total_distance > 0:
+    # Calculate percentage complete, rows already at the target count as 100%
+    with np.errstate(divide='ignore', invalid='ignore'):
         percent_complete = ((total_distance - remaining_distance) / total_distance) * 100
-        # Ensure percentage doesn't exceed 100% or go below 0%
-        percent_complete = max(0, min(100, percent_complete))
-    else:
-        percent_complete = 100.0  # Already at target
+    percent_complete = np.where(total_distance > 0, np.clip(percent_complete, 0, 100), 100.0)
     
     return (Predicted_longitude, Predicted_latitude, distance_traveled, percent_complete)
 
 
 
-def _bearing(p1, p2):
-    """Initial bearing (deg from true north) p1→p2."""
-    lat1, lon1, lat2, lon2 = map(math.radians, (*p1, *p2))
+def _initial_bearing(lat1, lon1, lat2, lon2):
+    """Initial bearing (deg from true north) from (lat1, lon1) to (lat2, lon2)."""
+    lat1, lon1, lat2, lon2 = math.radians(lat1), math.radians(lon1), math.radians(lat2), math.radians(lon2)
     dlon = lon2 - lon1
     x = math.sin(dlon) * math.cos(lat2)
     y = math.cos(lat1)*math.sin(lat2) - math.sin(lat1)*math.cos(lat2)*math.cos(dlon)
     brng = math.degrees(math.atan2(x, y))
     return (brng + 360) % 360
 
+# Scalar kernel for compiled callers
+_bearing_deg = njit(cache=True)(_initial_bearing)
+_bearing_ufunc = None
+
+def _bearing_v(lat1, lon1, lat2, lon2):
+    """Element-wise initial bearing for arrays of points, the parallel ufunc is built on first use."""
+    global _bearing_ufunc
+    if _bearing_ufunc is None:
+        _bearing_ufunc = vectorize(['float64(float64, float64, float64, float64)'], target='parallel', cache=True)(_initial_bearing)
+    return _bearing_ufunc(lat1, lon1, lat2, lon2)
+
+def _bearing(p1, p2):
+    """Initial bearing (deg from true north) p1→p2."""
+    if _native_bearing is not None:
+        return _native_bearing(p1[0], p1[1], p2[0], p2[1])
+    return _bearing_deg(p1[0], p1[1], p2[0], p2[1])
+
+@njit(cache=True)
+def _advance(current_long, current_lat, target_long, target_lat, direction, distance_traveled):
+    """Move distance_traveled meters along direction and measure the progress towards the target."""
+    # Calculate change in coordinates # https://www.sciencing.com/convert-distances-degrees-meters-7858322/
+    direction_rad = math.radians(direction)
+    inv_lon_scale = 1.0 / (111111.0 * math.cos(math.radians(current_lat)))
+    lat_change = (distance_traveled * math.cos(direction_rad)) / 111111.0
+    lon_change = distance_traveled * math.sin(direction_rad) * inv_lon_scale
+    
+    # Calculate predicted position
+    Predicted_latitude = current_lat + lat_change
+    Predicted_longitude = current_long + lon_change
+    
+    # Calculate total distance from current to target using haversine
+    total_distance = _haversine_m(current_lat, current_long, target_lat, target_long)
+    remaining_distance = _haversine_m(Predicted_latitude, Predicted_longitude, target_lat, target_long)
+    
+    # Calculate percentage complete
+    if total_distance > 0:
+        percent_complete = ((total_distance - remaining_distance) / total_distance) * 100
+        # Ensure percentage doesn't exceed 100% or go below 0%
+        percent_complete = max(0.0, min(100.0, percent_complete))
+    else:
+        percent_complete = 100.0  # Already at target
+    
+    return (Predicted_longitude, Predicted_latitude, distance_traveled, percent_complete)
+
+@njit(cache=True)
+def _predict_core(lat1, lon1, lat2, lon2, dt_seconds, target_lat, target_lon, time):
+    """Numeric body of predict_future_dist_with_history, history reduced to its endpoints."""
+    # direction and speed based on first and last history entries
+    direction = _bearing_deg(lat1, lon1, lat2, lon2)
+    speed = _haversine_m(lat1, lon1, lat2, lon2) / dt_seconds
+
+    distance_traveled = speed * time  # in meters
+
+    return _advance(lon2, lat2, target_lon, target_lat, direction, distance_traveled)
+
+@njit(cache=True)
+def _predict_dir_and_speed_core(current_long, current_lat, target_long, target_lat, direction, speed, time):
+    """Numeric body of predict_future_dist_with_dir_and_speed."""
+    distance_traveled = ((speed * 1000)/3600) * time
+    return _advance(current_long, current_lat, target_long, target_lat, direction, distance_traveled)
+
+def _to_ns(timestamps):
+    """Bulk-parse ISO strings (or datetimes) into int64 nanoseconds since the epoch, UTC for tz-aware input."""
+    return pd.to_datetime(timestamps, utc=True, format='ISO8601').as_unit('ns').asi8
+
+def _timestamp_to_ns(timestamp):
+    """Single-value _to_ns, without the overhead of the bulk parser."""
+    return pd.Timestamp(timestamp).as_unit('ns').value
+
+@dataclass(eq=False)
+class History:
+    """
+    Position history as parallel arrays, oldest entry first. The fields can be
+    reassigned together, e.g. sliced to a sliding window, and append continues
+    from the new arrays.
+
+    Attributes:
+        ts_ns (np.ndarray): Timestamps as int64 nanoseconds since the epoch.
+        lat (np.ndarray): Latitudes.
+        lon (np.ndarray): Longitudes.
+    """
+    ts_ns: np.ndarray
+    lat: np.ndarray
+    lon: np.ndarray
+
+    def __post_init__(self):
+        self.ts_ns = np.asarray(self.ts_ns, dtype=np.int64)
+        self.lat = np.asarray(self.lat, dtype=np.float64)
+        self.lon = np.asarray(self.lon, dtype=np.float64)
+        if not len(self.ts_ns) == len(self.lat) == len(self.lon):
+            raise ValueError("ts_ns, lat and lon must have the same length")
+        # Backing storage for append, the public fields are views of its first len(self) entries
+        self._buffers = (self.ts_ns, self.lat, self.lon)
+        self._views = self._buffers
+
+    @classmethod
+    def from_tuples(cls, history):
+        """Build from a list of (timestamp, latitude, longitude) tuples."""
+        timestamps, lats, lons = zip(*history)
+        return cls(_to_ns(timestamps), lats, lons)
+
+    def __len__(self):
+        return len(self.ts_ns)
+
+    def append(self, timestamp, lat, lon):
+        """Add an entry (timestamp as ISO string or datetime), doubling the storage when full."""
+        fields = (self.ts_ns, self.lat, self.lon)
+        n = len(fields[0])
+        if any(current is not view for current, view in zip(fields, self._views)):
+            # Fields were reassigned (e.g. trimmed to a sliding window), so they replace the buffers
+            if not len(self.lat) == len(self.lon) == n:
+                raise ValueError("ts_ns, lat and lon must have the same length")
+            self._buffers = fields
+
+        if n == len(self._buffers[0]):
+            capacity = max(2 * n, 16)
+            grown = []
+            for buf in self._buffers:
+                new_buf = np.empty(capacity, dtype=buf.dtype)
+                new_buf[:n] = buf[:n]
+                grown.append(new_buf)
+            self._buffers = tuple(grown)
+
+        ts_buf, lat_buf, lon_buf = self._buffers
+        ts_buf[n] = _timestamp_to_ns(timestamp)
+        lat_buf[n] = lat
+        lon_buf[n] = lon
+        self.ts_ns, self.lat, self.lon = ts_buf[:n + 1], lat_buf[:n + 1], lon_buf[:n + 1]
+        self._views = (self.ts_ns, self.lat, self.lon)
+
 def predict_future_dist_with_history(history, target_long, target_lat, time) -> tuple:
     """
     Predicts your position after a set time, given current 
     and target coordinates, movement direction, and speed.
 
     Args:
-        history (list) with timestamps, direction and coordinates:
+        history (History or list): History, or (timestamp, latitude, longitude) entries, oldest first.
         target_long (float): Target longitude.
         target_lat (float): Target latitude.
         time (float): Time interval in seconds.
@@ -78,45 +268,38 @@ def predict_future_dist_with_history(history, target_long, target_lat, time) ->
             - percent_complete (float): Trip completion percentage (0–100).
     """
 
-    lat1 = history[0][1]
-    lon1 = history[0][2]
-    lat2 = history[-1][1]
-    lon2 = history[-1][2]
-    current_lat = history[-1][1]
-    current_long = history[-1][2]
+    if not isinstance(history, History):
+        # Only the first and last entries are used, so only those are parsed
+        first, last = history[0], history[-1]
+        return predict_future_dist_with_history_arrays((_timestamp_to_ns(first[0]), _timestamp_to_ns(last[0])),
+                                                       (first[1], last[1]), (first[2], last[2]),
+                                                       target_long, target_lat, time)
 
-    # direction based on first and last history entries
-    direction = _bearing((lat1, lon1), (lat2, lon2))
-    
-    # start time and end time based on first and last history entries
-    historytime = (datetime.fromisoformat(history[-1][0]) - datetime.fromisoformat(history[0][0])).total_seconds()  
+    return predict_future_dist_with_history_arrays(history.ts_ns, history.lat, history.lon, target_long, target_lat, time)
 
-    # speed based on first and last history entries
-    speed = geodesic((lat1, lon1), (lat2, lon2)).meters / historytime
+def predict_future_dist_with_history_arrays(timestamps_ns, lats, lons, target_long, target_lat, time) -> tuple:
+    """
+    predict_future_dist_with_history for a history already held as parallel
+    arrays, so timestamps are parsed once at ingestion instead of on every call.
 
-    distance_traveled = speed * time  # in meters
+    Args:
+        timestamps_ns (np.ndarray): int64 nanoseconds since the epoch, oldest first.
+        lats (np.ndarray): Latitudes matching timestamps_ns.
+        lons (np.ndarray): Longitudes matching timestamps_ns.
+        target_long (float): Target longitude.
+        target_lat (float): Target latitude.
+        time (float): Time interval in seconds.
 
-    # Calculate change in coordinates # https://www.sciencing.com/convert-distances-degrees-meters-7858322/
-    lat_change = (distance_traveled * math.cos(math.radians(direction))) / 111111.0
-    lon_change = (distance_traveled * math.sin(math.radians(direction))) / (111111.0 * math.cos(math.radians(current_lat)))
-    
-    # Calculate predicted position
-    Predicted_latitude = current_lat + lat_change
-    Predicted_longitude = current_long + lon_change
-    
-    # Calculate total distance from current to target using geodesic
-    total_distance = geodesic((current_lat, current_long), (target_lat, target_long)).meters
-    remaining_distance = geodesic((Predicted_latitude, Predicted_longitude), (target_lat, target_long)).meters
-    
-    # Calculate percentage complete
-    if total_distance > 0:
-        percent_complete = ((total_distance - remaining_distance) / total_distance) * 100
-        # Ensure percentage doesn't exceed 100% or go below 0%
-        percent_complete = max(0, min(100, percent_complete))
-    else:
-        percent_complete = 100.0  # Already at target
-    
-    return (Predicted_longitude, Predicted_latitude, distance_traveled, percent_complete)
+    Returns:
+        tuple: Same as predict_future_dist_with_history.
+    """
+
+    # start time and end time based on first and last history entries
+    historytime = (timestamps_ns[-1] - timestamps_ns[0]) * 1e-9
+
+    predict_core = _native_predict_history if _native_predict_history is not None else _predict_core
+    return predict_core(lats[0], lons[0], lats[-1], lons[-1],
+                        historytime, target_lat, target_long, time)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,39 @@
+"""
+Ahead-of-time build of the location_functions kernels.
+
+Short-lived scripts otherwise pay numba's JIT compilation on their first
+prediction. Build once with
+
+    python utils/location_native.py
+
+which writes the _location_native extension module next to this file;
+location_functions picks it up automatically when it is present.
+"""
+import os
+import sys
+
+from numba.pycc import CC
+
+# Import under the same name the notebooks use, so numba's on-disk cache entries stay valid
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.location_functions import _initial_bearing, _predict_core, _predict_dir_and_speed_core
+
+cc = CC('_location_native')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+@cc.export('predict', 'UniTuple(f8, 4)(f8, f8, f8, f8, f8, f8, f8)')
+def predict(current_long, current_lat, target_long, target_lat, direction, speed, time):
+    return _predict_dir_and_speed_core(current_long, current_lat, target_long, target_lat, direction, speed, time)
+
+
+@cc.export('predict_history', 'UniTuple(f8, 4)(f8, f8, f8, f8, f8, f8, f8, f8)')
+def predict_history(lat1, lon1, lat2, lon2, dt_seconds, target_lat, target_lon, time):
+    return _predict_core(lat1, lon1, lat2, lon2, dt_seconds, target_lat, target_lon, time)
+
+
+cc.export('bearing', 'f8(f8, f8, f8, f8)')(_initial_bearing)
+
+
+if __name__ == "__main__":
+    cc.compile()